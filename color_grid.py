@@ -1,327 +1,376 @@
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the kernel runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Geometric regions of the 7x7 grid. These are input-independent, so they are
+# computed once at import time instead of on every call.
+_CORNERS = ((0,0), (0,1), (1,0), (0,6), (0,5), (1,6), (6,0), (5,0), (6,1), (6,6), (6,5), (5,6))
+
+# Edge cells: outer perimeter plus inner perimeter, excluding corners.
+_EDGES = tuple(
+    [(i,j) for i in range(7) for j in range(7)
+     if (i == 0 or i == 6 or j == 0 or j == 6) and (i,j) not in _CORNERS]
+    + [(i,j) for i in range(1,6) for j in range(1,6)
+       if (i == 1 or i == 5 or j == 1 or j == 5) and (i,j) not in _CORNERS]
+)
+
+# Face cells are the remaining interior cells
+_FACES = tuple((i,j) for i in range(2,5) for j in range(2,5))
+
+# Corner groups for symmetry
+_CORNER_GROUPS = (
+    ((0,0), (6,6)),  # Diagonal corners group 1
+    ((0,6), (6,0)),  # Diagonal corners group 2
+    ((0,1), (6,5)),  # Adjacent to corners with symmetry
+    ((1,0), (5,6)),
+    ((0,5), (6,1)),
+    ((1,6), (5,0))
+)
+
+_EDGE_GROUPS = (
+    ((6,3), (3,6), (0,3), (3,0)),  # Middle of outer edges
+    ((1,1), (5,5), (1,5), (5,1)),
+    ((5,2), (1,4)),
+    ((0,2), (0,4), (2,0), (4,0)), ((6,2), (6,4), (2,6), (4,6)),  # Other outer edges
+    ((1,2), (5,4), (1,3), (5,3)),  # Inner horizontal edges
+    ((2,1), (4,5), (4,1)), ((2,5), (3,1), (3,5))   # Inner vertical edges
+)
+
+_FACE_GROUPS = (
+    ((3,3),),  # Center
+    ((2,2), (4,4), (4,2), (2,4)),  # Diagonal from center
+    ((2,3), (4,3), (3,2), (3,4))   # Adjacent to center
+)
+
+# Region codes used by the jitted kernel
+_REGION_NONE, _REGION_CORNER, _REGION_EDGE, _REGION_FACE = 0, 1, 2, 3
+
+
+def _group_table(groups):
+    """Pack symmetry groups into a rectangular array of flat indices (i*7+j),
+    padded with -1, so the jitted kernel sees a single ndarray per table."""
+    table = np.full((len(groups), max(len(g) for g in groups)), -1, dtype=np.int8)
+    for gi, group in enumerate(groups):
+        for pi, (i, j) in enumerate(group):
+            table[gi, pi] = i * 7 + j
+    return table
+
+
+# Every symmetry group is an orbit of the grid's symmetry: one merged table
+# holds all of them, and the fill order for each pass is just an index
+# vector into it (corners 0-5, edges 6-13, faces 14-16).
+_ORBIT_GROUPS = _CORNER_GROUPS + _EDGE_GROUPS + _FACE_GROUPS
+_ORBIT_MEMBERS = _group_table(_ORBIT_GROUPS)
+_ORBIT_SIZE = np.array([len(group) for group in _ORBIT_GROUPS], dtype=np.int8)
+
+# Blue priority: corners then edges (faces follow as a separate pass with
+# their own budget); green priority: faces, corners, then edges reversed
+_BLUE_PERIMETER_ORDER = np.arange(14, dtype=np.int8)
+_BLUE_FACE_ORDER = np.arange(14, 17, dtype=np.int8)
+_GREEN_ORDER = np.array(
+    list(range(14, 17)) + list(range(6)) + list(range(13, 5, -1)), dtype=np.int8)
+
+# Region code per cell, replacing the set-membership tests: _REGION[i,j]
+# answers "which region is (i,j) in" with a single O(1) integer compare.
+_REGION = np.zeros((7, 7), dtype=np.int8)
+for _i, _j in _CORNERS:
+    _REGION[_i, _j] = _REGION_CORNER
+for _i, _j in _EDGES:
+    _REGION[_i, _j] = _REGION_EDGE
+for _i, _j in _FACES:
+    _REGION[_i, _j] = _REGION_FACE
+_REGION_FLAT = _REGION.ravel()
+
+# Region code of each orbit (all members of an orbit share one region)
+_ORBIT_REGION = np.array([_REGION[group[0]] for group in _ORBIT_GROUPS],
+                         dtype=np.int8)
+
+# Every member of an orbit lies in that orbit's region, so the kernel never
+# needs to re-test region membership per cell; check the invariant once here
+assert all(_REGION_FLAT[idx] == _ORBIT_REGION[oi]
+           for oi, row in enumerate(_ORBIT_MEMBERS) for idx in row if idx >= 0)
+
+# The 49 cells fit in one 64-bit word (bit i*7+j), so each orbit is also a
+# precomputed bitmask and whole-orbit fills reduce to two bitwise ORs
+_ORBIT_MASK = np.array(
+    [sum(1 << (i * 7 + j) for (i, j) in group) for group in _ORBIT_GROUPS],
+    dtype=np.int64)
+
+
+@njit(cache=True)
+def _popcount49(x):
+    """SWAR population count for a 49-bit board held in an int64."""
+    x = x - ((x >> 1) & 0x5555555555555555)
+    x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+    x = x + (x >> 8)
+    x = x + (x >> 16)
+    x = x + (x >> 32)
+    return x & 0x7F
+
+
+@njit(cache=True)
+def _fill_orbits(occupied, colored, order, members, orbit_size, orbit_mask,
+                 orbit_region, color_budget, region_budgets, cap_corners,
+                 even_partial):
+    """
+    Color the available positions of each symmetry orbit until a budget runs out.
+
+    The grid state lives in two 49-bit boards: `occupied` has a bit set for
+    every colored cell and `colored` for the cells of the color being placed.
+    An orbit's free cells are orbit_mask & ~occupied, a complete fill is two
+    ORs, and only partial fills walk the member list, because they must take
+    the first free cells in orbit member order rather than bit order.
+
+    Parameters:
+    - occupied, colored: current boards
+    - order: orbit indices in fill-priority order
+    - members: rectangular table of flat cell indices, one orbit per row,
+      -1 padded (_ORBIT_MEMBERS)
+    - orbit_size: number of real members in each row (_ORBIT_SIZE)
+    - orbit_mask: member bitmask of each orbit (_ORBIT_MASK)
+    - orbit_region: region code of each orbit (_ORBIT_REGION)
+    - color_budget: how many cells of this color may still be placed
+    - region_budgets: per-region remaining graft budgets, updated in place
+    - cap_corners: also limit corner-orbit fills by the vertex budget
+    - even_partial: when an orbit cannot be filled completely, only fill an
+      even number of positions so symmetric pairs stay intact
+
+    Returns:
+    - (occupied, colored, color_budget) after filling
+
+    Once a region's budget is exhausted its later orbits are skipped, but an
+    orbit whose region budget was already spent when this pass reached it
+    still gets one fill - that quirk is inherited from the original
+    per-region loops, which only re-checked their budget after each group.
+    """
+    region_done = np.zeros(4, dtype=np.bool_)
+    for o in range(order.shape[0]):
+        orbit = order[o]
+        region = orbit_region[orbit]
+        if region_done[region]:
+            continue
+
+        free = orbit_mask[orbit] & ~occupied
+        n_available = _popcount49(free)
+
+        if even_partial and n_available > color_budget:
+            # Not enough remaining spots, but aim for symmetry
+            positions_to_fill = 2 * min(color_budget // 2, n_available // 2)
+        else:
+            positions_to_fill = min(n_available, color_budget)
+            if cap_corners and region == _REGION_CORNER:
+                positions_to_fill = min(positions_to_fill, region_budgets[region])
+
+        if positions_to_fill > 0:
+            if positions_to_fill == n_available:
+                # Whole orbit: merge the free mask in one go
+                occupied |= free
+                colored |= free
+            else:
+                # Partial fill: take the first free cells in member order
+                filled = 0
+                for p in range(orbit_size[orbit]):
+                    bit = np.int64(1) << np.int64(members[orbit, p])
+                    if occupied & bit:
+                        continue
+                    occupied |= bit
+                    colored |= bit
+                    filled += 1
+                    if filled == positions_to_fill:
+                        break
+            color_budget -= positions_to_fill
+            region_budgets[region] -= positions_to_fill
+
+        if region_budgets[region] <= 0:
+            region_done[region] = True
+        if color_budget <= 0:
+            break
+    return occupied, colored, color_budget
+
+
+@njit(cache=True)
+def _decode_boards(blue_board, green_board):
+    """Expand the two color boards back into a flat int8 grid."""
+    grid_flat = np.zeros(49, dtype=np.int8)
+    for idx in range(49):
+        bit = np.int64(1) << np.int64(idx)
+        if blue_board & bit:
+            grid_flat[idx] = 2
+        elif green_board & bit:
+            grid_flat[idx] = 1
+    return grid_flat
+
+# Grids depend only on the derived integer chain counts, so every distinct
+# float input that truncates to the same counts shares one table entry. The
+# table is filled lazily: eagerly enumerating the full reachable set
+# (roughly 13 x 25 x 10 chain-count tuples times their hydrophobic counts,
+# ~75k grids) would add seconds of import time for entries most sweeps
+# never touch.
+_GRID_TABLE = {}
+
+
+def _grid_for_chain_counts(vertex_chains, edge_chains, face_chains,
+                           hydrophobic_count):
+    """Build (or fetch) the grid for one tuple of integer chain counts."""
+    key = (vertex_chains, edge_chains, face_chains, hydrophobic_count)
+    grid = _GRID_TABLE.get(key)
+    if grid is not None:
+        return grid
+
+    total_chains = vertex_chains + edge_chains + face_chains
+
+    # Calculate non-hydrophobic count
+    non_hydrophobic_count = total_chains - hydrophobic_count
+
+    # Grid state during allocation: two 49-bit boards (decoded to an int8
+    # grid at the end)
+    occupied = np.int64(0)
+    blue_board = np.int64(0)
+    green_board = np.int64(0)
+
+    # Per-region graft budgets, indexed by region code and shared by all
+    # passes so the green pass sees whatever the blue pass left behind
+    region_budgets = np.array([0, vertex_chains, edge_chains, face_chains],
+                              dtype=np.int64)
+
+    # Apply blue (hydrophobic) allocation with priority: corners, edges, faces
+    # 1./2. Fill corners, then edges, with blue
+    occupied, blue_board, blue_budget = _fill_orbits(
+        occupied, blue_board, _BLUE_PERIMETER_ORDER, _ORBIT_MEMBERS,
+        _ORBIT_SIZE, _ORBIT_MASK, _ORBIT_REGION,
+        hydrophobic_count, region_budgets, True, False)
+
+    # 3. Third priority: Fill faces with blue in a symmetrical pattern
+    blue_count = hydrophobic_count - blue_budget
+    remaining_blue = min(total_chains - blue_count, blue_budget)
+    occupied, blue_board, _ = _fill_orbits(
+        occupied, blue_board, _BLUE_FACE_ORDER, _ORBIT_MEMBERS,
+        _ORBIT_SIZE, _ORBIT_MASK, _ORBIT_REGION,
+        remaining_blue, region_budgets, False, True)
+
+    # Now distribute green (non-hydrophobic) with the same symmetry patterns:
+    # faces first, then corners, finally edges
+    occupied, green_board, _ = _fill_orbits(
+        occupied, green_board, _GREEN_ORDER, _ORBIT_MEMBERS,
+        _ORBIT_SIZE, _ORBIT_MASK, _ORBIT_REGION,
+        non_hydrophobic_count, region_budgets, False, False)
+
+    grid = _decode_boards(blue_board, green_board).reshape(7, 7)
+    grid.setflags(write=False)
+    _GRID_TABLE[key] = grid
+    return grid
+
 
+@functools.lru_cache(maxsize=256)
 def create_facet_grid_pattern(vertex_gd=0.5, edge_gd=0.5, face_gd=0.5, blue_ratio=0.3):
     """
     Create a 7×7 grid pattern for a specific facet with uniform parameters across all facets.
-    
+
+    The output depends only on the integer chain counts derived below, so
+    grids are served from a table keyed by those counts (filled on first
+    use), with an lru_cache on the raw float arguments in front of it. The
+    returned array is marked read-only because it is shared between callers.
+
     Parameters:
     - vertex_gd: Grafting density for vertices/corners (0.0-1.0)
     - edge_gd: Grafting density for edges (0.0-1.0)
     - face_gd: Grafting density for face/interior cells (0.0-1.0)
     - blue_ratio: Proportion of molecules that should be hydrophobic, or blue in the coloring problem (0.0-1.0)
-    
+
     Returns:
-    - grid: 7×7 numpy array with values 0 (white/removed), 1 (green/non-hydrophobic), 2 (blue/hydrophobic)
+    - grid: 7×7 int8 numpy array with values 0 (white/removed), 1 (green/non-hydrophobic), 2 (blue/hydrophobic)
     """
-    # Make molecules and assign them sequentially
-    facet_molecules = list(range(49))
-    grid_molecules = np.zeros((7, 7), dtype=int)
-    
-    # Arrange molecules in the grid (row by row, with IDs increasing left to right)
-    for i in range(7):
-        for j in range(7):
-            index = i * 7 + j
-            grid_molecules[i, j] = facet_molecules[index]
-    
-    # Define geometric regions based on the create_grid_pattern function
-    corners = [(0,0), (0,1), (1,0), (0,6), (0,5), (1,6), (6,0), (5,0), (6,1), (6,6), (6,5), (5,6)]
-    
-    edges = []
-    # Outer perimeter (excluding corners)
-    for i in range(7):
-        for j in range(7):
-            if i == 0 or i == 6 or j == 0 or j == 6:
-                if (i,j) not in corners:
-                    edges.append((i,j))
-    
-    # Inner perimeter (excluding corners)
-    for i in range(1,6):
-        for j in range(1,6):
-            if i == 1 or i == 5 or j == 1 or j == 5:
-                if (i,j) not in corners:
-                    edges.append((i,j))
-    
-    # Face cells are the remaining interior cells
-    faces = [(i,j) for i in range(2,5) for j in range(2,5)]
-    
     # Calculate the total number of chains and color ratios based on input parameters
-    vertex_chains = int(vertex_gd * len(corners))
-    edge_chains = int(edge_gd * len(edges))
-    face_chains = int(face_gd * len(faces))
-    
+    vertex_chains = int(vertex_gd * len(_CORNERS))
+    edge_chains = int(edge_gd * len(_EDGES))
+    face_chains = int(face_gd * len(_FACES))
+
     # Calculate total chains and hydrophobic counts
     total_chains = vertex_chains + edge_chains + face_chains
-    
-
     hydrophobic_count = int(total_chains * blue_ratio)
 
-    # Calculate non-hydrophobic count
-    non_hydrophobic_count = total_chains - hydrophobic_count
-    
-    # Create the grid pattern
-    grid = np.zeros((7, 7), dtype=int)
-    
-    # Initialize sets to track molecules
-    
-    # Apply blue (hydrophobic) allocation with priority: corners, edges, faces
-    blue_count = 0
-    
-    # Corner groups for symmetry
-    corner_groups = [
-        [(0,0), (6,6)],  # Diagonal corners group 1
-        [(0,6), (6,0)],  # Diagonal corners group 2
-        [(0,1), (6,5)],  # Adjacent to corners with symmetry
-        [(1,0), (5,6)],
-        [(0,5), (6,1)],
-        [(1,6), (5,0)]
-    ]
-    
-    # Keep track of number of colored sites
-    current_vertex_count = 0
-    current_edge_count = 0
-    current_face_count = 0
-    
-    # 1. First priority: Fill corners with blue
-    for group in corner_groups:
-        for pos in group:
-            if current_vertex_count >= vertex_chains or blue_count >= hydrophobic_count:
-                break
-            
-            grid[pos] = 2  # Blue
-            blue_count += 1
-            current_vertex_count += 1
-        if current_vertex_count >= vertex_chains:
-            break
-    
-    # 2. Second priority: Fill edges with blue
-    edge_groups = [
-        [(6,3), (3,6), (0,3), (3,0)],  # Middle of outer edges
-        [(1,1), (5,5), (1,5), (5,1)],
-        [(5,2), (1,4)],
-        [(0,2), (0,4), (2,0), (4,0)], [(6,2), (6,4), (2,6), (4,6)],  # Other outer edges
-        [(1,2), (5,4), (1,3), (5,3)],  # Inner horizontal edges
-        [(2,1), (4,5), (4,1)], [(2,5), (3,1), (3,5)]   # Inner vertical edges
-    ]
-    
-    sites_at_high_curvature_region = vertex_chains + edge_chains
-    
-    for group in edge_groups:
-        available_positions = [pos for pos in group if pos in edges and grid[pos] == 0]
-        positions_to_fill = min(len(available_positions), hydrophobic_count - blue_count)
+    return _grid_for_chain_counts(vertex_chains, edge_chains, face_chains,
+                                  hydrophobic_count)
 
-        if positions_to_fill <= 0:
-            break
-            
-        # Prioritize maintaining symmetry
-        if positions_to_fill >= 2 and positions_to_fill % 2 == 0 and len(available_positions) % 2 == 0:
-            # Fill in pairs to maintain symmetry
-            for i in range(0, positions_to_fill, 2):
-                if i+1 < len(available_positions):
-                    pos1, pos2 = available_positions[i], available_positions[i+1]
-                    grid[pos1] = 2
-                    grid[pos2] = 2
-                    blue_count += 2
-                    current_edge_count += 2
-        else:
-            # Fill as many as possible
-            for i in range(positions_to_fill):
-                if i < len(available_positions):
-                    pos = available_positions[i]
-                    grid[pos] = 2
-                    blue_count += 1
-                    current_edge_count += 1
-        if current_edge_count >= edge_chains or blue_count >= hydrophobic_count:
-            break
-    
-    # 3. Third priority: Fill faces with blue in a symmetrical pattern
-    face_groups = [
-        [(3,3)],  # Center
-        [(2,2), (4,4), (4,2), (2,4)],  # Diagonal from center
-        [(2,3), (4,3), (3,2), (3,4)]   # Adjacent to center
-    ]
-    
-    total_chains_target = sites_at_high_curvature_region + face_chains
-    remaining_blue = min(total_chains_target - blue_count, hydrophobic_count - blue_count)
-    
-    for group in face_groups:
-        available_positions = [pos for pos in group if pos in faces and grid[pos] == 0]
-        
-        if len(available_positions) <= remaining_blue:
-            # Fill the whole group
-            for pos in available_positions:
-                grid[pos] = 2  # Blue
-                blue_count += 1
-                current_face_count += 1
-                remaining_blue -= 1
-        else:
-            # Not enough remaining spots, but aim for symmetry
-            if len(group) == 1:  # Single center cell
-                if remaining_blue >= 1:
-                    grid[group[0]] = 2
-                    blue_count += 1
-                    current_face_count += 1
-                    remaining_blue -= 1
-            elif remaining_blue >= 2:  # Fill pairs when possible
-                pairs_to_fill = min(remaining_blue // 2, len(available_positions) // 2)
-                for i in range(pairs_to_fill):
-                    if 2*i+1 < len(available_positions):
-                        pos1, pos2 = available_positions[2*i], available_positions[2*i+1]
-                        grid[pos1] = 2
-                        grid[pos2] = 2
-                        blue_count += 2
-                        current_face_count += 2
-                        remaining_blue -= 2
-            
-        if remaining_blue <= 0:
-            break
-        if current_face_count >= face_chains:
-            break
-    
-    # Now distribute green (non-hydrophobic) with similar symmetry patterns
-    green_count = 0
-    target_green_remaining = non_hydrophobic_count
-    
-    # First try to place green in face positions that aren't already blue
-    for group in face_groups:
-        available_pos = [pos for pos in group if grid[pos] == 0]
-        positions_to_fill = min(len(available_pos), target_green_remaining)
-        
-        if positions_to_fill > 0:
-            if positions_to_fill == len(available_pos):
-                # Fill all available positions
-                for pos in available_pos:
-                    grid[pos] = 1  # Green
-                    green_count += 1
-                    current_face_count += 1
-                    target_green_remaining -= 1
-            elif positions_to_fill % 2 == 0 and len(available_pos) % 2 == 0:
-                # Fill in pairs to maintain symmetry
-                for i in range(0, positions_to_fill, 2):
-                    if i+1 < len(available_pos):
-                        pos1, pos2 = available_pos[i], available_pos[i+1]
-                        grid[pos1] = 1
-                        grid[pos2] = 1
-                        green_count += 2
-                        current_face_count += 2
-                        target_green_remaining -= 2
-            else:
-                # Fill as many as possible
-                for i in range(positions_to_fill):
-                    pos = available_pos[i]
-                    grid[pos] = 1
-                    green_count += 1
-                    current_face_count += 1
-                    target_green_remaining -= 1
-        if current_face_count >= face_chains:
-            break
-    
-    # Then corner positions
-    for group in corner_groups:
-        available_pos = [pos for pos in group if grid[pos] == 0]
-        positions_to_fill = min(len(available_pos), target_green_remaining)
-        
-        if positions_to_fill > 0:
-            if positions_to_fill == len(available_pos):
-                # Fill all available positions
-                for pos in available_pos:
-                    grid[pos] = 1  # Green
-                    green_count += 1
-                    current_vertex_count += 1
-                    target_green_remaining -= 1
-            elif positions_to_fill % 2 == 0 and len(available_pos) % 2 == 0:
-                # Fill in pairs to maintain symmetry
-                for i in range(0, positions_to_fill, 2):
-                    if i+1 < len(available_pos):
-                        pos1, pos2 = available_pos[i], available_pos[i+1]
-                        grid[pos1] = 1
-                        grid[pos2] = 1
-                        green_count += 2
-                        current_vertex_count += 2
-                        target_green_remaining -= 2
-            else:
-                # Fill as many as possible
-                for i in range(positions_to_fill):
-                    pos = available_pos[i]
-                    grid[pos] = 1
-                    green_count += 1
-                    current_vertex_count += 1
-                    target_green_remaining -= 1
-        
-        if target_green_remaining <= 0:
-            break
-        if current_vertex_count >= vertex_chains:
-            break
 
-    # Finally edge positions
-    for group in reversed(edge_groups):
-        available_pos = [pos for pos in group if grid[pos] == 0]
-        positions_to_fill = min(len(available_pos), target_green_remaining)
-        
-        if positions_to_fill > 0:
-            if positions_to_fill == len(available_pos):
-                # Fill all available positions
-                for pos in available_pos:
-                    grid[pos] = 1  # Green
-                    green_count += 1
-                    current_edge_count += 1
-                    target_green_remaining -= 1
-            elif positions_to_fill % 2 == 0 and len(available_pos) % 2 == 0:
-                # Fill in pairs to maintain symmetry
-                for i in range(0, positions_to_fill, 2):
-                    if i+1 < len(available_pos):
-                        pos1, pos2 = available_pos[i], available_pos[i+1]
-                        grid[pos1] = 1
-                        grid[pos2] = 1
-                        green_count += 2
-                        current_edge_count += 2
-                        target_green_remaining -= 2
-            else:
-                # Fill as many as possible
-                for i in range(positions_to_fill):
-                    pos = available_pos[i]
-                    grid[pos] = 1
-                    green_count += 1
-                    current_edge_count += 1
-                    target_green_remaining -= 1
-        
-        if target_green_remaining <= 0:
-            break
-        if current_edge_count >= edge_chains:
-            break
-    
-    return grid
+# Reuse one figure per figsize: creating a figure is by far the most
+# expensive step when rendering many parameter combinations in a row
+_FIG_CACHE = {}
 
-def create_sphere_grid_visualization(grid, title="", show_stats=True):
+
+def _cached_figure(figsize):
+    fig = _FIG_CACHE.get(figsize)
+    if fig is None:
+        # A bare Figure with an Agg canvas skips pyplot's global figure
+        # manager and GUI event-loop hooks, which the save-to-PNG path
+        # never needs
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _FIG_CACHE[figsize] = fig
+    fig.clf()
+    return fig
+
+
+def create_sphere_grid_visualization(grid, title="", show_stats=True, ax=None,
+                                     raster=False):
     """
     Create a sphere-based visualization of the 7x7 grid pattern.
-    
+
     Parameters:
     - grid: 7x7 numpy array with values 0 (white), 1 (green), 2 (blue)
-    - ax: matplotlib axis to plot on
+    - ax: matplotlib axis to plot on (a cached figure is reused if omitted)
     - title: title for the subplot
     - show_stats: whether to show statistics text
+    - raster: render as flat colored squares via imshow instead of spheres;
+      faster for quick previews of large parameter sweeps
     """
     # Define colors for spheres
     colors = ['grey', 'green', 'blue']
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(6, 6))
-    # Create sphere positions in 7x7 grid
-    sphere_radius = 0.45
-    spacing = 1.0
-    
-    # Plot spheres for each position
-    for i in range(7):
-        for j in range(7):
-            x = j * spacing
-            y = (6-i) * spacing   #flip y-axis to match grid orientation
-            
-            # Get color based on grid value
-            color = colors[grid[i, j]]
-            
-            # Create circle (sphere in 2D)
-            circle = plt.Circle((x, y), sphere_radius, color=color, edgecolor='black', linewidth=1)
-            ax.add_patch(circle)
+    # Create (or reuse) figure and axis
+    if ax is None:
+        fig = _cached_figure((6, 6))
+        ax = fig.add_subplot(111)
+    else:
+        fig = ax.figure
+
+    if raster:
+        # Entire grid drawn as one image in the Agg raster path
+        ax.imshow(grid, cmap=ListedColormap(colors), vmin=0, vmax=2,
+                  origin='upper', interpolation='nearest',
+                  extent=(-0.5, 6.5, -0.5, 6.5))
+    else:
+        # Create sphere positions in 7x7 grid
+        sphere_radius = 0.45
+        spacing = 1.0
+
+        # Plot all spheres as one collection instead of 49 separate patches
+        jj, ii = np.meshgrid(np.arange(7), np.arange(7))
+        x = jj.ravel() * spacing
+        y = (6 - ii.ravel()) * spacing   #flip y-axis to match grid orientation
+
+        # Get colors based on grid values
+        face_colors = np.array(colors)[np.asarray(grid).ravel()]
+
+        # Create circles (spheres in 2D) in a single draw call
+        spheres = EllipseCollection(
+            widths=2 * sphere_radius, heights=2 * sphere_radius, angles=0,
+            units='xy', offsets=np.column_stack([x, y]),
+            offset_transform=ax.transData,
+            facecolors=face_colors, edgecolors='black', linewidths=1)
+        ax.add_collection(spheres)
     
     # Set axis limits and properties
     ax.set_xlim(-0.5, 6.5)
@@ -335,10 +384,9 @@ def create_sphere_grid_visualization(grid, title="", show_stats=True):
     
     # Add statistics if requested
     if show_stats:
-        # Calculate statistics
-        white_count = np.sum(grid == 0)
-        green_count = np.sum(grid == 1)
-        blue_count = np.sum(grid == 2)
+        # Calculate statistics in one pass over the grid
+        counts = np.bincount(np.asarray(grid).ravel(), minlength=3)
+        white_count, green_count, blue_count = counts[0], counts[1], counts[2]
         total_grafted = green_count + blue_count
         
         # Calculate actual hydrophobic ratio
@@ -354,7 +402,7 @@ def create_sphere_grid_visualization(grid, title="", show_stats=True):
 
         # ax.text(x_center, -0.5, f'$\Gamma$,H = ({total_gd:.2f},{actual_h_ratio:.2f})', fontsize=7, ha='center', va='bottom',
         #         bbox=dict(boxstyle="square,pad=0.1", facecolor='white', alpha=0.8))
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -374,11 +422,37 @@ def create_sample_visualization(vertex_gd, edge_gd, face_gd, blue_ratio):
     
     # Save the figure
     fig.savefig('sample_color_grid.png', dpi=300, bbox_inches='tight')
-    
-    plt.show()
+
     return fig
 
 
+def _render_one(params):
+    """Worker for render_batch: build, render and save one combination."""
+    vertex_gd, edge_gd, face_gd, blue_ratio = params
+    grid = create_facet_grid_pattern(vertex_gd, edge_gd, face_gd, blue_ratio)
+    title = f"Design constraint: v={vertex_gd}, e={edge_gd}, f={face_gd}, H={blue_ratio}"
+    fig = create_sphere_grid_visualization(grid, title=title, show_stats=True)
+    fig.savefig(f"grid_{vertex_gd}_{edge_gd}_{face_gd}_{blue_ratio}.png",
+                dpi=300, bbox_inches='tight')
+
+
+def render_batch(param_list, n_workers=None):
+    """
+    Render a PNG for every parameter combination using a process pool.
+
+    Parameters:
+    - param_list: iterable of (vertex_gd, edge_gd, face_gd, blue_ratio) tuples
+    - n_workers: number of worker processes (defaults to the core count)
+
+    Each combination is saved as grid_<v>_<e>_<f>_<H>.png in the working
+    directory. Every worker keeps its own grid and figure caches, so large
+    sweeps scale roughly linearly with cores.
+    """
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        # Consume the iterator so worker exceptions surface here
+        list(executor.map(_render_one, param_list))
+
+
 if __name__ == "__main__":
     #design parameters. change here
     vertex_gd = 1.0